@@ -152,32 +152,59 @@ def Colorize(text):
   return '\n'.join([_ColorizeLine(line) for line in text.split('\n')])
 
 
+def _IndexExceptions(exceptions):
+  """Indexes a list of exceptions by error type.
+
+  Args:
+    exceptions: a list of (severity, layer, stopcode, module_regexp,
+        symbol_regexp) tuples.
+
+  Returns:
+    A dictionary mapping (severity, layer, stopcode) tuples to lists of
+    (module_re, symbol_re) compiled regular expressions. Empty regular
+    expressions are stored as None, and match anything.
+  """
+  index = {}
+  for (severity, layer, stopcode, module_regexp, symbol_regexp) in exceptions:
+    module_re = None
+    if module_regexp:
+      module_re = re.compile(module_regexp)
+    symbol_re = None
+    if symbol_regexp:
+      symbol_re = re.compile(symbol_regexp)
+    index.setdefault((severity, layer, stopcode), []).append(
+        (module_re, symbol_re))
+  return index
+
+
 def FilterExceptions(image_name, errors):
   """Filter out the Application Verifier errors that have exceptions."""
-  exceptions = _EXCEPTIONS.get(image_name, [])
-  exceptions.extend(_GLOBAL_EXCEPTIONS)
+  # Build a new list, as the global ones must not be modified.
+  exceptions = _EXCEPTIONS.get(image_name, []) + _GLOBAL_EXCEPTIONS
+  index = _IndexExceptions(exceptions)
 
   def _HasNoException(error):
-    # Iterate over all the exceptions.
-    for (severity, layer, stopcode, module_regexp, symbol_regexp) in exceptions:
-      # And see if they match, first by type.
-      if (error.severity == severity and
-          error.layer == layer and
-          error.stopcode == stopcode):
-        # And then by regexpr match to the trace symbols.
-        for trace in error.trace:
-          module_matches = True
-          if module_regexp:
-            module_matches = (
-                trace.module and re.match(module_regexp, trace.module))
-
-          symbol_matches = True
-          if symbol_regexp:
-            symbol_matches = (
-                trace.symbol and re.match(symbol_regexp, trace.symbol))
-
-          if module_matches and symbol_matches:
-            return False
+    # Only look at the exceptions that match the type of the error.
+    rules = index.get((error.severity, error.layer, error.stopcode))
+    if not rules:
+      return True
+
+    # Pull the frames out of the trace once, rather than once per rule.
+    frames = [(trace.module, trace.symbol) for trace in error.trace]
+
+    for (module_re, symbol_re) in rules:
+      # See if they match by regexpr to the trace symbols.
+      for (module, symbol) in frames:
+        module_matches = True
+        if module_re:
+          module_matches = module and module_re.match(module)
+
+        symbol_matches = True
+        if symbol_re:
+          symbol_matches = symbol and symbol_re.match(symbol)
+
+        if module_matches and symbol_matches:
+          return False
 
     return True
 
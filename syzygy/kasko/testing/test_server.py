@@ -18,6 +18,7 @@ import msvcrt
 import optparse
 import os
 import re
+import shutil
 import struct
 import sys
 import tempfile
@@ -31,11 +32,14 @@ def serve_file_handler(file_path):
 
     def do_GET(self):
       f = open(file_path, 'rb')
-      contents = f.read()
-      self.send_response(200)
-      self.send_header("Content-Type", "application/x-ns-proxy-autoconfig")
-      self.end_headers()
-      self.wfile.write(contents)
+      try:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ns-proxy-autoconfig")
+        self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+        self.end_headers()
+        shutil.copyfileobj(f, self.wfile)
+      finally:
+        f.close()
   return ServeFileHandler
 
 def multipart_form_handler(incoming_directory):
@@ -20,6 +20,10 @@ import etw.descriptors.process as process
 
 class _Module(object):
   """Store the state for a single loaded module."""
+  # One of these is created for every module load event, so avoid the
+  # per-instance dictionary.
+  __slots__ = ('module_base', 'module_size', 'file_name')
+
   def __init__(self, event):
     """Initializes a module object from a module load event."""
     self.module_base = event.ImageBase
@@ -90,8 +90,9 @@ class Popen(subprocess.Popen):
     self._origreturncode = None
     self._newreturncode = None
 
-    # Set up the environment for the subprocess.
-    env = kwargs.pop('env', os.environ)
+    # Set up the environment for the subprocess. This works on a copy, as
+    # several of these may be launched concurrently from different threads.
+    env = dict(kwargs.pop('env', os.environ))
     self._temp = tempfile.mkdtemp(prefix='temp_watcher_')
     env['TMP'] = self._temp
     env['TEMP'] = self._temp
@@ -18,6 +18,7 @@ import cStringIO
 import datetime
 import hashlib
 import logging
+import multiprocessing.pool
 import optparse
 import os
 import presubmit
@@ -30,6 +31,11 @@ import temp_watcher
 _LOGGER = logging.getLogger(os.path.basename(__file__))
 
 
+# How often, in seconds, to wake up while waiting on concurrently running
+# tests.
+_POLL_INTERVAL_S = 1
+
+
 class Error(Exception):
   """An error class used for reporting problems while running tests."""
   pass
@@ -102,6 +108,8 @@ class Test(object):
     self._build_dir = build_dir
     self._name = name
     self._force = False
+    self._jobs = 1
+    self._exit_first = False
     self._leaf = leaf
 
     # Tests are to direct all of their output to these streams.
@@ -238,7 +246,7 @@ class Test(object):
     self._Touch(configuration)
     self._MakeSuccessFile(configuration)
 
-  def Run(self, configuration, force=False):
+  def Run(self, configuration, force=False, jobs=1, exit_first=False):
     """Runs the test in the given configuration. The derived instance of Test
     must implement '_Run(self, configuration)', which raises an exception on
     error or does nothing on success. Upon success of _Run, this will generate
@@ -249,6 +257,10 @@ class Test(object):
       configuration: The configuration in which to run.
       force: If True, this will force the test to re-run even if _NeedToRun
           would return False.
+      jobs: The maximum number of child tests that a test suite may run
+          concurrently. Defaults to 1, which runs them serially.
+      exit_first: If True, a test suite stops running its tests as soon as
+          one of them fails.
 
     Returns:
       True on success, False otherwise.
@@ -256,6 +268,8 @@ class Test(object):
     # Store optional arguments in a side-channel, so as to allow additions
     # without changing the _Run/_NeedToRun/_CanRun API.
     self._force = force
+    self._jobs = jobs
+    self._exit_first = exit_first
 
     success = True
     try:
@@ -295,8 +309,10 @@ class Test(object):
                             style.RESET_ALL)
       success = False
     finally:
-      # Forward the stdout, which we've caught and stuffed in a string.
+      # Forward the stdout, which we've caught and stuffed in a string. This
+      # is flushed so that progress is visible as each test completes.
       sys.stdout.write(self._GetStdout())
+      sys.stdout.flush()
 
     return success
 
@@ -317,6 +333,12 @@ class Test(object):
     parser.add_option('-f', '--force', dest='force',
                       action='store_true', default=False,
                       help='Force tests to re-run even if not necessary.')
+    parser.add_option('-j', '--jobs', dest='jobs', type='int', default=1,
+                      help='The maximum number of tests to run concurrently. '
+                           'Defaults to 1.')
+    parser.add_option('-x', '--exit-first', dest='exit_first',
+                      action='store_true', default=False,
+                      help='Stop running tests after the first failure.')
     parser.add_option('-t', '--touch', dest='touch',
                       action='store_true', default=False,
                       help='Touch the test outputs to make as if they have '
@@ -335,6 +357,8 @@ class Test(object):
 
     if options.force and options.touch:
       opt_parser.error("--force and --touch don't go together, pick one.")
+    if options.jobs < 1:
+      opt_parser.error('--jobs must be at least 1.')
 
     logging.basicConfig(level=options.log_level)
 
@@ -349,10 +373,13 @@ class Test(object):
       # tests.
       if options.touch:
         self.Touch(config)
-      elif not self.Run(config, force=options.force):
+      elif not self.Run(config, force=options.force, jobs=options.jobs,
+                        exit_first=options.exit_first):
         _LOGGER.error('Configuration "%s" of test "%s" failed.',
                       config, self._name)
         result = 1
+        if options.exit_first:
+          break
 
     # Now dump all error messages.
     sys.stdout.write(self._GetStderr())
@@ -555,16 +582,74 @@ class TestSuite(Test):
     """Implementation of this Test object.
 
     Runs the provided collection of tests, generating a global success file
-    upon completion of them all. Runs all tests even if any test fails. Stops
-    running all tests if any of them raises an exception.
+    upon completion of them all. Runs all tests even if any test fails, unless
+    this suite was built with stop_on_first_failure or run with exit_first.
+    Stops running all tests if any of them raises an exception.
     """
+    if (self._jobs > 1 and len(self._tests) > 1 and
+        not self._stop_on_first_failure):
+      return self._RunConcurrently(configuration)
+
     success = True
     for test in self._tests:
-      if not test.Run(configuration, force=self._force):
+      if not test.Run(configuration, force=self._force, jobs=self._jobs,
+                      exit_first=self._exit_first):
         # Keep a cumulative log of all stderr from each test that fails.
         self._WriteStderr(test._GetStderr())  # pylint: disable=W0212
-        if self._stop_on_first_failure:
+        if self._stop_on_first_failure or self._exit_first:
           return False
         success = False
 
     return success
+
+  def _RunConcurrently(self, configuration):
+    """Runs the provided collection of tests using a pool of self._jobs
+    threads. Each test buffers its own output and forwards it in a single
+    write once it completes, so the output of concurrent tests isn't
+    interleaved. Child tests are run serially, so as not to nest pools. If
+    self._exit_first is set then tests that haven't yet started are dropped
+    as soon as one fails.
+
+    Args:
+      configuration: the configuration in which to run the tests.
+
+    Returns:
+      True if all tests succeeded, False otherwise.
+    """
+    # Results are recorded by the worker threads themselves, so that those of
+    # tests that were still running when we stopped waiting aren't lost.
+    finished = []
+    def _RunOne(test):
+      result = test.Run(configuration, force=self._force, jobs=1,
+                        exit_first=self._exit_first)
+      finished.append((test, result))
+      return result
+
+    pool = multiprocessing.pool.ThreadPool(min(self._jobs, len(self._tests)))
+    try:
+      results = pool.imap_unordered(_RunOne, self._tests)
+      while True:
+        # Wait with a timeout, as an untimed wait can't be interrupted with
+        # Ctrl-C.
+        try:
+          result = results.next(_POLL_INTERVAL_S)
+        except multiprocessing.TimeoutError:
+          continue
+        except StopIteration:
+          break
+        if not result and self._exit_first:
+          break
+    finally:
+      # This discards any tests that haven't started yet, and waits for those
+      # that are already running.
+      pool.terminate()
+      pool.join()
+
+    success = True
+    for test, result in finished:
+      if not result:
+        # Keep a cumulative log of all stderr from each test that fails.
+        self._WriteStderr(test._GetStderr())  # pylint: disable=W0212
+        success = False
+
+    return success
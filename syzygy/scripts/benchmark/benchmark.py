@@ -97,6 +97,11 @@ def _GetOptionParser():
                     help='Lists the available metrics and exits.')
   parser.add_option('--trace-file-archive-dir', metavar='DIR',
                     help='Directory in which to archive the ETW trace logs')
+  parser.add_option('--kernel-min-buffers', dest='kernel_min_buffers',
+                    type='int', metavar='N',
+                    help='The minimum number of buffers to use for the kernel '
+                         'ETW session. Raise this if ETW events are being '
+                         'lost.')
   parser.add_option('--startup-type', dest='startup_type', metavar='TYPE',
                     choices=runner.ALL_STARTUP_TYPES,
                     default=runner.DEFAULT_STARTUP_TYPE,
@@ -160,7 +165,8 @@ def main():
                                             opts.ibmperf_dir,
                                             opts.ibmperf_run,
                                             opts.ibmperf_metrics,
-                                            opts.trace_file_archive_dir)
+                                            opts.trace_file_archive_dir,
+                                            opts.kernel_min_buffers)
   benchmark_runner.ConfigureStartup(opts.startup_type, opts.startup_urls)
   benchmark_runner.Run(opts.iterations)
 
@@ -13,7 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """A utility module for controlling Chrome instances."""
-import exceptions
 import json
 import logging
 import os
@@ -133,6 +132,7 @@ def ShutDown(profile_dir, timeout_ms=win32event.INFINITE):
     # Did we time out?
     if timeout_ms == 0:
       _LOGGER.error('Time-out waiting for Chrome process to exit.')
+      process_handle.Close()
       raise TimeoutException
 
   exit_status = win32process.GetExitCodeProcess(process_handle)
@@ -159,8 +159,8 @@ _PREREAD_VALUE = 'PreRead'
 def _GetDWORDValue(key, name):
   try:
     (value, dummy_value_type) = _winreg.QueryValueEx(key, name)
-  except exceptions.WindowsError, ex:
-    if ex.errno is not winerror.ERROR_FILE_NOT_FOUND:
+  except OSError as ex:
+    if ex.errno != winerror.ERROR_FILE_NOT_FOUND:
       raise
     return None
 
@@ -178,9 +178,9 @@ def GetPreload():
       if percentage is None:
         percentage = 0 if _GetDWORDValue(key, _PREREAD_VALUE) == 0 else 100
       return percentage
-  except exceptions.WindowsError, ex:
+  except OSError as ex:
     # We expect specific errors on non-present key or values.
-    if ex.errno is not winerror.ERROR_FILE_NOT_FOUND:
+    if ex.errno != winerror.ERROR_FILE_NOT_FOUND:
       raise
     else:
       return 100
@@ -190,8 +190,8 @@ def _SetDWORDValueImpl(key, name, value):
   if value == None:
     try:
       _winreg.DeleteValue(key, name)
-    except WindowsError, ex:
-      if ex.errno is not winerror.ERROR_FILE_NOT_FOUND:
+    except OSError as ex:
+      if ex.errno != winerror.ERROR_FILE_NOT_FOUND:
         raise
   else:
     _winreg.SetValueEx(key, name, None, _winreg.REG_DWORD, value)
@@ -225,6 +225,16 @@ def KillNamedProcesses(process_name):
   subprocess.call(['taskkill.exe', '/IM', process_name])
 
 
+def KillProcessTree(process_id):
+  """Forcefully kills a process and all of its descendants. Only works on
+  Windows.
+
+  Args:
+    process_id: The ID of the root process to kill.
+  """
+  subprocess.call(['taskkill.exe', '/F', '/T', '/PID', str(process_id)])
+
+
 def _GetPreferencesFile(profile_dir):
   """ Returns the path to the preferences file stored in the chrome profile
   given by @profile_dir.
@@ -20,7 +20,6 @@ import etw.descriptors.pagefault as pagefault
 import etw.descriptors.process as process
 import logging
 import os.path
-import re
 
 # This import is required to have some setup performed behind the scenes, but
 # we don't ever directly refer to it. Ignore pylint complaining about an unused
@@ -29,7 +28,7 @@ import re
 import etw.descriptors.pagefault_xp as pagefault_xp
 
 # TODO(siggi): Make these configurable?
-_CHROME_RE = re.compile(r'^chrome\.exe$', re.I)
+_CHROME_EXE = 'chrome.exe'
 _MODULES_TO_TRACK = set(['chrome.exe', 'chrome.dll'])
 _OPTIONAL_MODULES_TO_TRACK = set(['chrome_child.dll'])
 
@@ -62,18 +61,16 @@ def _MakeEmptySoftFaultDict():
 class LogEventCounter(etw.EventConsumer):
   """A utility class to parse salient metrics from ETW logs."""
 
-  def __init__(self, file_db, module_db, process_db):
+  def __init__(self, module_db, process_db):
     """Initialize a log event counter.
 
     Args:
-        file_db: an etw_db.FileNameDatabase instance.
         module_db: an etw_db.ModuleDatabase instance.
         process_db: an etw_db.ProcessThreadDatabase instance.
     """
     # etw.EventConsumer is an old-style class, so super() doesn't work.
     etw.EventConsumer.__init__(self)
 
-    self._file_db = file_db
     self._module_db = module_db
     self._process_db = process_db
     self._process_launch = []
@@ -91,7 +88,7 @@ class LogEventCounter(etw.EventConsumer):
 
   @etw.EventHandler(process.Event.Start)
   def _OnProcessStart(self, event):
-    if _CHROME_RE.search(event.ImageFileName):
+    if event.ImageFileName.lower() == _CHROME_EXE:
       self._process_launch.append(event.time_stamp)
 
   def FinalizeCounts(self):
@@ -134,7 +131,8 @@ class LogEventCounter(etw.EventConsumer):
   def _OnHardFault(self, event):
     # Resolve the thread id in the event back to the faulting process.
     process_desc = self._process_db.GetThreadProcess(event.TThreadId)
-    if process_desc and _CHROME_RE.search(process_desc.image_file_name):
+    if (process_desc and
+        process_desc.image_file_name.lower() == _CHROME_EXE):
       module_name = self._GetModuleName(process_desc, event)
       self._hardfaults.setdefault(module_name, 0)
       self._hardfaults[module_name] += 1
@@ -146,7 +144,8 @@ class LogEventCounter(etw.EventConsumer):
 
     # Resolve the faulting process.
     process_desc = self._process_db.GetProcess(event.process_id)
-    if process_desc and _CHROME_RE.search(process_desc.image_file_name):
+    if (process_desc and
+        process_desc.image_file_name.lower() == _CHROME_EXE):
       module_name = self._GetModuleName(process_desc, event)
       UpdateModuleCount(module_name)
 
@@ -59,6 +59,19 @@ _LOGGER = logging.getLogger(__name__)
 _XP_MAJOR_VERSION = 5
 
 
+# How long to wait for a launched Chrome instance to come up, and how often to
+# check on it in the meantime. Use a long timeout just in case the machine is
+# REALLY bogged down. This could be the case on the build-bot slave, for
+# example.
+_CHROME_START_TIMEOUT_S = 5 * 60
+_CHROME_START_POLL_INTERVAL_S = 0.1
+
+
+# How long to wait for Chrome to shut down at the end of an iteration before
+# forcefully killing it.
+_CHROME_SHUTDOWN_TIMEOUT_MS = 60 * 1000
+
+
 # Registry key that will allegedly always contain the path to IE.
 _IE_APP_PATH_KEY = (
     r'SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths\IEXPLORE.EXE')
@@ -193,6 +206,8 @@ class ChromeRunner(object):
     self._call_trace_log_path = None
     self._call_trace_log_file = None
     self._http_server = None
+    # The process launched by the current iteration, if any.
+    self._chrome_process = None
 
     self._profile_dir_is_temp = self._profile_dir == None
     if self._profile_dir_is_temp:
@@ -234,11 +249,14 @@ class ChromeRunner(object):
     self._startup_urls = [] if url_list is None else url_list
 
   @staticmethod
-  def StartLoggingEtw(log_dir):
+  def StartLoggingEtw(log_dir, kernel_min_buffers=None):
     """Starts ETW Logging to the files provided.
 
     Args:
         log_dir: Directory where kernel.etl and call_trace.etl will be created.
+        kernel_min_buffers: The minimum number of ETW buffers to allocate to
+            the kernel session. If None, call_trace_control.exe picks a value
+            based on the number of processors.
     """
     # Best effort cleanup in case the log sessions are already running.
     subprocess.call([_GetExePath('call_trace_control.exe'), 'stop'])
@@ -249,6 +267,8 @@ class ChromeRunner(object):
            'start',
            '--kernel-file=%s' % kernel_file,
            '--call-trace-file=%s' % call_trace_file]
+    if kernel_min_buffers is not None:
+      cmd.append('--kernel-min-buffers=%d' % kernel_min_buffers)
     _LOGGER.info('Starting ETW logging to "%s" and "%s".',
         kernel_file, call_trace_file)
     ret = subprocess.call(cmd)
@@ -393,6 +413,13 @@ class ChromeRunner(object):
 
   def _TearDown(self):
     """Invoked once after all iterations are complete, or on failure."""
+    # Make sure the Chrome launched by the last iteration doesn't outlive the
+    # benchmark, e.g. if that iteration failed before shutting it down.
+    if self._chrome_process and self._chrome_process.poll() is None:
+      _LOGGER.warning('Chrome is still running, killing it.')
+      chrome_control.KillProcessTree(self._chrome_process.pid)
+    self._chrome_process = None
+
     if self._profile_dir_is_temp:
       _LOGGER.info('Deleting temporary profile directory "%s".',
                    self._profile_dir)
@@ -407,12 +434,21 @@ class ChromeRunner(object):
     _LOGGER.info("Iteration: %d", i)
 
     process = self._LaunchChrome()
+    self._chrome_process = process
     self._WaitTillChromeRunning(process)
     try:
       self._DoIteration(i)
     finally:
       _LOGGER.info("Shutting down Chrome Profile: %s", self._profile_dir)
-      chrome_control.ShutDown(self._profile_dir)
+      try:
+        chrome_control.ShutDown(self._profile_dir,
+                                timeout_ms=_CHROME_SHUTDOWN_TIMEOUT_MS)
+      except chrome_control.TimeoutException:
+        # Don't let a wedged browser hold up the remaining iterations. Only
+        # the process tree we launched is killed, leaving any other Chrome
+        # instances on the machine alone.
+        _LOGGER.warning('Chrome failed to shut down in time, killing it.')
+        chrome_control.KillProcessTree(process.pid)
 
   def _DoIteration(self, dummy_it):
     """Invoked each iteration after Chrome has successfully launched."""
@@ -500,11 +536,12 @@ class ChromeRunner(object):
           it terminates early.
     """
     _LOGGER.debug('Waiting until Chrome is running.')
-    # Use a long timeout just in case the machine is REALLY bogged down.
-    # This could be the case on the build-bot slave, for example.
-    for dummy_i in xrange(5 * 60):
-      _LOGGER.info('Looking for Chrome instance with profile_dir %s.',
-                   self._profile_dir)
+    _LOGGER.info('Looking for Chrome instance with profile_dir %s.',
+                 self._profile_dir)
+    # Poll at a short interval so that the iteration can proceed as soon as
+    # the browser window shows up, rather than on the next whole second.
+    deadline = time.time() + _CHROME_START_TIMEOUT_S
+    while True:
       if chrome_control.IsProfileRunning(self._profile_dir):
         _LOGGER.debug('Found running instance of Chrome.')
         return
@@ -513,7 +550,10 @@ class ChromeRunner(object):
       if process.poll() != None:
         raise RunnerError('Chrome process terminated early.')
 
-      time.sleep(1)
+      if time.time() >= deadline:
+        break
+
+      time.sleep(_CHROME_START_POLL_INTERVAL_S)
 
     raise RunnerError('Timeout waiting for Chrome.')
 
@@ -592,7 +632,7 @@ class ChromeFrameRunner(ChromeRunner):
     try:
       with _winreg.OpenKey(_winreg.HKEY_LOCAL_MACHINE, _IE_APP_PATH_KEY) as key:
         ie_path = str(_winreg.QueryValue(key, None))  # Reads the default value.
-    except WindowsError:
+    except OSError:
       pass
 
     if not os.path.exists(ie_path):
@@ -638,7 +678,8 @@ class BenchmarkRunner(ChromeRunner):
 
   def __init__(self, chrome_exe, profile_dir, preload, cold_start, prefetch,
                keep_temp_dirs, initialize_profile, ibmperf_dir, ibmperf_run,
-               ibmperf_metrics, trace_file_archive_dir=None):
+               ibmperf_metrics, trace_file_archive_dir=None,
+               kernel_min_buffers=None):
     """Initialize instance.
 
     Args:
@@ -662,6 +703,9 @@ class BenchmarkRunner(ChromeRunner):
             gathered.
         ibmperf_metrics: List of metrics to be gathered using ibmperf.
         trace_file_archive_dir: Directory in which to archive the ETW logs.
+        kernel_min_buffers: The minimum number of buffers to give the kernel
+            ETW session. Raise this if events are being lost. If None, the
+            call_trace_control.exe default is used.
     """
     super(BenchmarkRunner, self).__init__(
         chrome_exe, profile_dir, initialize_profile=initialize_profile)
@@ -672,6 +716,7 @@ class BenchmarkRunner(ChromeRunner):
     self._results = {}
     self._temp_dir = trace_file_archive_dir
     self._session_urls = []
+    self._kernel_min_buffers = kernel_min_buffers
 
     self._ibmperf_metrics = None
     self._old_preload = None
@@ -761,7 +806,8 @@ class BenchmarkRunner(ChromeRunner):
       _DeletePrefetch()
 
   def _StartLogging(self):
-    self.StartLoggingEtw(self._temp_dir)
+    self.StartLoggingEtw(self._temp_dir,
+                         kernel_min_buffers=self._kernel_min_buffers)
     self._kernel_file = os.path.join(self._temp_dir, 'kernel.etl')
 
   def _StopLogging(self):
@@ -777,11 +823,9 @@ class BenchmarkRunner(ChromeRunner):
     parser = etw.consumer.TraceEventSource()
     parser.OpenFileSession(self._kernel_file)
 
-    file_db = etw_db.FileNameDatabase()
     module_db = etw_db.ModuleDatabase()
     process_db = etw_db.ProcessThreadDatabase()
-    counter = event_counter.LogEventCounter(file_db, module_db, process_db)
-    parser.AddHandler(file_db)
+    counter = event_counter.LogEventCounter(module_db, process_db)
     parser.AddHandler(module_db)
     parser.AddHandler(process_db)
     parser.AddHandler(counter)
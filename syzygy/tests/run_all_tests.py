@@ -23,7 +23,7 @@ import logging
 
 
 _SELF_DIR = os.path.dirname(os.path.abspath(__file__))
-_SYZYGY_DIR = os.path.abspath(_SELF_DIR + '/..')
+_SYZYGY_DIR = os.path.dirname(_SELF_DIR)
 _SCRIPT_DIR = os.path.join(_SYZYGY_DIR, 'py')
 
 
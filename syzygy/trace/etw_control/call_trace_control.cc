@@ -43,6 +43,7 @@ struct CallTraceOptions {
   FileMode file_mode;
   int flags;
   int min_buffers;
+  int kernel_min_buffers;
 };
 
 // Initializes the command-line and logging for functions called via rundll32.
@@ -85,6 +86,12 @@ static bool ParseOptions(CallTraceOptions* options) {
     options->min_buffers = 0;
   }
 
+  if (!base::StringToInt(
+          cmd_line->GetSwitchValueASCII("kernel-min-buffers"),
+          &options->kernel_min_buffers)) {
+    options->kernel_min_buffers = 0;
+  }
+
   if (cmd_line->HasSwitch("append"))
     options->file_mode = kFileAppend;
   else
@@ -125,9 +132,12 @@ static void SetupEtwProperties(EtwTraceType trace_type,
 
       // Kernel traces need two buffers per CPU: one flushing to disk, the other
       // being used for live events. This has been sufficient in all situations
-      // we've seen thus far.
+      // we've seen thus far. Traces with many page fault events may need more,
+      // so this can be raised from the command-line.
       p->MinimumBuffers = 2 * sysinfo.dwNumberOfProcessors;
-      p->MaximumBuffers = 4 * sysinfo.dwNumberOfProcessors;
+      if (options.kernel_min_buffers > signed(p->MinimumBuffers))
+        p->MinimumBuffers = options.kernel_min_buffers;
+      p->MaximumBuffers = 2 * p->MinimumBuffers;
       break;
     }
 
@@ -36,7 +36,10 @@ static const char kUsage[] =
     "      Defaults to 'kernel.etl' in the current working directory.\n"
     "  --kernel-flags: Flags to pass to kernel ETW logger (numeric).\n"
     "      Defaults to PROCESS|THREAD|IMAGE_LOAD|DISK_IO|DISK_FILE_IO|\n"
-    "                  MEMORY_PAGE_FAULTS|MEMORY_HARD_FAULTS|FILE_IO.\n";
+    "                  MEMORY_PAGE_FAULTS|MEMORY_HARD_FAULTS|FILE_IO.\n"
+    "  --kernel-min-buffers: The minimum number of buffers to use for the\n"
+    "      kernel logger. Augment this from the defaults if seeing lost\n"
+    "      events. Defaults to 2 per CPU.\n";
 
 int Usage() {
   std::cout << kUsage;